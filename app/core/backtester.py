@@ -12,113 +12,240 @@ TODO: INSERT YOUR BACKTESTING LOGIC HERE
 """
 
 import csv
-from typing import Dict, List
+import os
+import threading
+from collections import OrderedDict
+from itertools import islice
+import numpy as np
 from app.core import fuzzy_engine, stat_engine, hybrid_engine, kelly
 
-async def run_backtest(data_path: str, initial_bankroll: float = 7000.0) -> Dict:
+# CSV columns consumed by the backtester, in load order
+_COLUMNS = (
+    "home_goals_avg", "away_goals_avg", "home_win_rate", "away_win_rate",
+    "odds_home", "odds_draw", "odds_away", "outcome"
+)
+
+# Odds at or above this are treated as data-entry errors
+_MAX_ODDS = 1000.0
+
+# At odds <= 1.05 a bet needs p_home > ~0.97; the statistical model regresses
+# towards 1/3 and never exceeds 0.8, so the hybrid can never get there
+_MIN_BETTABLE_ODDS = 1.05
+
+# Absorbs rounding in the hybrid normalization when applying the p_stat bound
+_BOUND_SLACK = 1e-9
+
+# Lines parsed per chunk when streaming the CSV
+_CHUNK_ROWS = 1 << 16
+
+# Parsed CSV columns keyed by (path, mtime_ns, size), least recently used first
+_PARSE_CACHE_SIZE = 4
+_parse_cache: "OrderedDict[tuple[str, int, int], dict[str, np.ndarray]]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+def _parse_chunk(lines: list[str], usecols: list[int]) -> np.ndarray:
+    """Parse CSV lines into an (n, len(_COLUMNS)) float64 block"""
+    # e.g. trailing newlines landing in the last chunk; np.loadtxt would warn about empty input
+    if not any(line.strip() for line in lines):
+        return np.empty((0, len(_COLUMNS)))
+
+    try:
+        # Same quoting rules as the csv.reader used for the header
+        return np.loadtxt(
+            lines, delimiter=",", quotechar='"', usecols=usecols, dtype=np.float64, ndmin=2
+        )
+    except ValueError:
+        # Malformed values: fall back to csv.reader and drop the rows that fail
+        # float() parsing, matching the previous per-row behaviour
+        rows = []
+        for record in csv.reader(lines):
+            try:
+                rows.append([float(record[i]) for i in usecols])
+            except (IndexError, ValueError):
+                continue
+        return np.array(rows, dtype=np.float64).reshape(-1, len(_COLUMNS))
+
+def _filter_rows(block: np.ndarray) -> np.ndarray:
+    """Keep only rows with valid inputs whose odds leave room for a bet"""
+    _, _, home_win_rate, away_win_rate, odds_home, odds_draw, odds_away, _ = block.T
+    
+    # Decimal odds must exceed 1.0; reject obvious data-entry errors
+    valid = (
+        (odds_home > 1.0) & (odds_draw > 1.0) & (odds_away > 1.0)
+        & (odds_home < _MAX_ODDS)
+        & (home_win_rate >= 0) & (home_win_rate <= 1)
+        & (away_win_rate >= 0) & (away_win_rate <= 1)
+    )
+    
+    # Odds too short for any reachable probability
+    valid &= odds_home > _MIN_BETTABLE_ODDS
+    
+    return block[valid]
+
+def _load_columns(data_path: str) -> dict[str, np.ndarray]:
+    """
+    Stream the match CSV and return one float64 array per column
+    
+    The file is parsed _CHUNK_ROWS lines at a time with NumPy's C CSV parser
+    and each chunk is filtered immediately, so only rows that can take part
+    in the backtest are ever accumulated.
+    """
+    with open(data_path, "r", encoding="utf-8", newline="") as f:
+        header = [name.strip() for name in next(csv.reader(f), [])]
+        
+        missing = [name for name in _COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f"Missing CSV columns: {', '.join(missing)}")
+        usecols = [header.index(name) for name in _COLUMNS]
+        
+        blocks = [
+            _filter_rows(_parse_chunk(lines, usecols))
+            for lines in iter(lambda: list(islice(f, _CHUNK_ROWS)), [])
+        ]
+    
+    data = np.concatenate(blocks) if blocks else np.empty((0, len(_COLUMNS)))
+    data = np.ascontiguousarray(data.T)
+    return {name: data[i] for i, name in enumerate(_COLUMNS)}
+
+def _load_columns_cached(data_path: str) -> dict[str, np.ndarray]:
+    """
+    _load_columns with a small LRU cache, so re-running a backtest on an
+    unchanged upload skips the parse
+    
+    Cached arrays are marked read-only since they are shared between runs.
+    """
+    st = os.stat(data_path)
+    key = (os.path.abspath(data_path), st.st_mtime_ns, st.st_size)
+    
+    with _parse_cache_lock:
+        columns = _parse_cache.get(key)
+        if columns is not None:
+            _parse_cache.move_to_end(key)
+            return columns
+    
+    columns = _load_columns(data_path)
+    for values in columns.values():
+        values.flags.writeable = False
+    
+    with _parse_cache_lock:
+        _parse_cache[key] = columns
+        _parse_cache.move_to_end(key)
+        while len(_parse_cache) > _PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    
+    return columns
+
+def _select(columns: dict[str, np.ndarray], mask: np.ndarray) -> dict[str, np.ndarray]:
+    """Keep only the rows of every column where mask is True"""
+    return {name: values[mask] for name, values in columns.items()}
+
+def run_backtest_sync(
+    data_path: str,
+    initial_bankroll: float = 7000.0
+) -> dict:
     """
     Run backtest on historical data
     
+    CPU-bound and blocking; the API runs it in a worker process.
+    
     Args:
         data_path: Path to CSV file with match data
         initial_bankroll: Starting bankroll amount
     
     Returns:
-        Dictionary with backtest results
+        Dictionary with backtest results; equity_curve is a float64 ndarray
     
     Expected CSV format:
         home_goals_avg, away_goals_avg, home_win_rate, away_win_rate,
         odds_home, odds_draw, odds_away, outcome
     
     Backtesting process:
-    1. For each match in dataset:
-       a. Generate prediction using hybrid model
-       b. Calculate Kelly stake
-       c. Place bet (if stake > 0)
-       d. Update bankroll based on outcome
-       e. Record result
-    
-    2. Calculate metrics:
+    1. Stream the CSV into columnar arrays, dropping invalid matches
+       chunk by chunk
+    2. Score every valid match in one vectorized pass through the
+       statistical, fuzzy and hybrid engines
+    3. For each match with enough edge, in order:
+       a. Calculate Kelly stake against the current bankroll
+       b. Place bet (if stake > 0)
+       c. Update bankroll based on outcome
+       d. Record result
+    
+    4. Calculate metrics:
        - ROI = (final - initial) / initial * 100
        - Win rate = wins / total_bets
        - Equity curve = bankroll over time
     """
     
     bankroll = initial_bankroll
-    equity_curve = [bankroll]
     total_bets = 0
     winning_bets = 0
     
     try:
-        with open(data_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        # Only valid, bettable matches survive the load
+        columns = _load_columns_cached(data_path)
+        home_goals_avg = columns["home_goals_avg"]
+        away_goals_avg = columns["away_goals_avg"]
+        odds_home = columns["odds_home"]
+        
+        # Only bet if probability > implied probability with edge
+        min_edge = 0.02  # Need at least 2% edge
+        required_prob = 1.0 / odds_home + min_edge
+        
+        # Statistical model first: with equal hybrid weights and p_fuzzy <= 1,
+        # p_hybrid <= (p_stat + 1) / 2, so rows under that bound can never bet
+        p_stat = stat_engine.calculate_probability_array(
+            home_goals_avg, away_goals_avg, columns["home_win_rate"], columns["away_win_rate"]
+        )
+        reachable = (p_stat[:, 0] + 1.0) / 2.0 + _BOUND_SLACK > required_prob
+        columns = _select(columns, reachable)
+        home_goals_avg = columns["home_goals_avg"]
+        away_goals_avg = columns["away_goals_avg"]
+        odds_home = columns["odds_home"]
+        outcome = columns["outcome"]  # 1=home win, 0=else
+        p_stat = p_stat[reachable]
+        required_prob = required_prob[reachable]
+        
+        # Fuzzy model and hybrid combination only for the remaining matches
+        p_fuzzy = fuzzy_engine.calculate_probability_array(
+            home_goals_avg, away_goals_avg, odds_home, columns["odds_draw"], columns["odds_away"]
+        )
+        p_hybrid = hybrid_engine.combine_probabilities_array(p_stat, p_fuzzy)[:, 0]
+        has_edge = p_hybrid > required_prob
+        
+        # At most one equity point per candidate bet, plus the starting bankroll
+        equity_curve = np.empty(int(has_edge.sum()) + 1, dtype=np.float64)
+        equity_curve[0] = bankroll
+        ec_i = 1
+        
+        # Calculate Kelly fractions for all candidate bets at once
+        odds_bet = odds_home[has_edge]
+        kelly_fracs = kelly.calculate_fraction_array(p_hybrid[has_edge], odds_bet, kelly_fraction=0.25)
+        
+        # Bankroll is path-dependent, so staking stays sequential
+        for kelly_frac, odds, result in zip(
+            kelly_fracs.tolist(),
+            odds_bet.tolist(),
+            outcome[has_edge].tolist()
+        ):
+            stake = round(bankroll * kelly_frac, 2)
+            
+            if stake <= 0:
+                continue
+            
+            # Record bet
+            total_bets += 1
+            
+            # Determine outcome
+            if result == 1:  # Home team won
+                winning_bets += 1
+                profit = stake * (odds - 1)
+                bankroll += profit
+            else:  # Loss
+                bankroll -= stake
             
-            for row in reader:
-                try:
-                    # Parse match data from CSV
-                    home_goals_avg = float(row.get('home_goals_avg'))
-                    # print(home_goals_avg)
-                    away_goals_avg = float(row.get('away_goals_avg'))
-                    home_win_rate = float(row.get('home_win_rate'))
-                    away_win_rate = float(row.get('away_win_rate'))
-                    odds_home = float(row.get('odds_home'))
-                    odds_draw = float(row.get('odds_draw'))
-                    odds_away = float(row.get('odds_away'))
-                    outcome = int(row.get('outcome'))  # 1=home win, 0=else
-                    
-                    # Validate inputs
-                    
-                    # print(odds_home)
-                    # print(odds_draw)
-                    # print(odds_away)
-                    if odds_home >= 1.0 or odds_draw >= 1.0 or odds_away >= 1.0:
-                        continue
-                        
-                    if not (0 <= home_win_rate <= 1) or not (0 <= away_win_rate <= 1): 
-                        continue
-                    
-                    # Generate predictions using hybrid model
-                    p_stat = stat_engine.calculate_probability(
-                        home_goals_avg, away_goals_avg, home_win_rate, away_win_rate
-                    )
-                    p_fuzzy = fuzzy_engine.calculate_probability(
-                        home_goals_avg, away_goals_avg, odds_home, odds_draw, odds_away
-                    )
-                    p_hybrid = hybrid_engine.combine_probabilities(p_stat, p_fuzzy)
-                    
-                    # Only bet if probability > implied probability with edge
-                    implied_prob = 1.0 / odds_home
-                    min_edge = 0.02  # Need at least 2% edge
-                    
-                    if p_hybrid <= (implied_prob + min_edge):
-                        continue
-                    
-                    # Calculate Kelly stake
-                    kelly_frac, stake = kelly.calculate_stake(
-                        p_hybrid, odds_home, bankroll, kelly_fraction=0.25
-                    )
-                    
-                    if stake <= 0:
-                        continue
-                    
-                    # Record bet
-                    total_bets += 1
-                    
-                    print(total_bets)
-                    # Determine outcome
-                    if outcome == 1:  # Home team won
-                        winning_bets += 1
-                        profit = stake * (odds_home - 1)
-                        bankroll += profit
-                    else:  # Loss
-                        bankroll -= stake
-                    
-                    # Track equity curve
-                    equity_curve.append(bankroll)
-                
-                except (ValueError, KeyError):
-                    # Skip malformed rows
-                    continue
+            # Track equity curve
+            equity_curve[ec_i] = bankroll
+            ec_i += 1
     
         # Calculate performance metrics
         losing_bets = total_bets - winning_bets
@@ -129,7 +256,7 @@ async def run_backtest(data_path: str, initial_bankroll: float = 7000.0) -> Dict
             "total_bets": total_bets,
             "winning_bets": winning_bets,
             "losing_bets": losing_bets,
-            "equity_curve": [round(v, 2) for v in equity_curve],
+            "equity_curve": np.round(equity_curve[:ec_i], 2),
             "final_bankroll": round(bankroll, 2)
         }
     except FileNotFoundError:
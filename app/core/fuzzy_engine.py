@@ -10,9 +10,15 @@ TODO: INSERT YOUR FUZZY LOGIC IMPLEMENTATION HERE
 - Defuzzification
 """
 
+from functools import lru_cache
+
+import numpy as np
+
 class FuzzyEngine:
     def __init__(self):
         self.membership_funcs = self._init_membership_functions()
+        self.membership_params = self._init_membership_params()
+        self.membership_table = self._init_membership_table()
     
     def _init_membership_functions(self):
         """Initialize triangular membership functions for inputs"""
@@ -29,13 +35,30 @@ class FuzzyEngine:
             }
         }
     
-    def triangular_membership(self, x: float, a: float, b: float, c: float) -> float:
-        """Triangular membership function: returns degree of membership"""
-        if x <= a or x >= c:
-            return 0.0
-        if a < x <= b:
-            return (x - a) / (b - a) if b > a else 0.0
-        return (c - x) / (c - b) if c > b else 0.0
+    def _init_membership_params(self):
+        """Precompute (a, c, 1/(b-a), 1/(c-b)) per membership function so evaluation only multiplies"""
+        return {
+            variable: {label: (a, c, 1.0 / (b - a), 1.0 / (c - b)) for label, (a, b, c) in sets.items()}
+            for variable, sets in self.membership_funcs.items()
+        }
+    
+    def _init_membership_table(self):
+        """
+        Stack membership parameters into (9,) arrays for batch evaluation
+        
+        Column order: home_goals low/medium/high, away_goals low/medium/high,
+        implied_prob low/medium/high.
+        """
+        goals = self.membership_params["goals"]
+        prob = self.membership_params["implied_prob"]
+        params = [goals[label] for label in ("low", "medium", "high")] * 2
+        params += [prob[label] for label in ("low", "medium", "high")]
+        return tuple(np.array(column, dtype=np.float64) for column in zip(*params))
+    
+    def membership(self, x: float, params: tuple[float, float, float, float]) -> float:
+        """Triangular membership degree, branchless, from precomputed (a, c, 1/(b-a), 1/(c-b))"""
+        a, c, inv_ba, inv_cb = params
+        return max(0.0, min((x - a) * inv_ba, (c - x) * inv_cb))
     
     def fuzzify(self, home_goals: float, away_goals: float, odds_home: float, odds_draw: float, odds_away: float):
         """Convert crisp inputs to fuzzy sets"""
@@ -43,20 +66,24 @@ class FuzzyEngine:
         total_odds = 1/odds_home + 1/odds_draw + 1/odds_away
         implied_prob_home = (1/odds_home) / total_odds
         
+        mu = self.membership
+        goals = self.membership_params["goals"]
+        prob = self.membership_params["implied_prob"]
+        
         # Fuzzify home goals
-        home_low = self.triangular_membership(home_goals, 0.0, 0.5, 1.5)
-        home_med = self.triangular_membership(home_goals, 1.0, 1.5, 2.5)
-        home_high = self.triangular_membership(home_goals, 2.0, 3.0, 5.0)
+        home_low = mu(home_goals, goals["low"])
+        home_med = mu(home_goals, goals["medium"])
+        home_high = mu(home_goals, goals["high"])
         
         # Fuzzify away goals
-        away_low = self.triangular_membership(away_goals, 0.0, 0.5, 1.5)
-        away_med = self.triangular_membership(away_goals, 1.0, 1.5, 2.5)
-        away_high = self.triangular_membership(away_goals, 2.0, 3.0, 5.0)
+        away_low = mu(away_goals, goals["low"])
+        away_med = mu(away_goals, goals["medium"])
+        away_high = mu(away_goals, goals["high"])
         
         # Fuzzify implied probability
-        prob_low = self.triangular_membership(implied_prob_home, 0.0, 0.25, 0.45)
-        prob_med = self.triangular_membership(implied_prob_home, 0.35, 0.50, 0.65)
-        prob_high = self.triangular_membership(implied_prob_home, 0.55, 0.75, 1.0)
+        prob_low = mu(implied_prob_home, prob["low"])
+        prob_med = mu(implied_prob_home, prob["medium"])
+        prob_high = mu(implied_prob_home, prob["high"])
         
         return {
             "home_goals": {"low": home_low, "med": home_med, "high": home_high},
@@ -65,60 +92,98 @@ class FuzzyEngine:
             "implied_prob": implied_prob_home
         }
     
-    def apply_rules(self, fuzzy_sets):
-        """Fuzzy rules engine - Sugeno style"""
+    def infer_home(self, fuzzy_sets) -> float:
+        """Sugeno rule evaluation and defuzzification (weighted average) for home win"""
         home_goals = fuzzy_sets["home_goals"]
         away_goals = fuzzy_sets["away_goals"]
         prob = fuzzy_sets["prob"]
-        
-        # Sugeno consequents (crisp outputs)
-        consequents = {
-            "very_high": 0.85,
-            "high": 0.70,
-            "medium": 0.50,
-            "low": 0.30,
-            "very_low": 0.15
-        }
-        
-        # Rule strengths (antecedent weights)
-        rule_fire = {}
+        home_low, home_med, home_high = home_goals["low"], home_goals["med"], home_goals["high"]
+        away_low, away_med, away_high = away_goals["low"], away_goals["med"], away_goals["high"]
         
         # Rule 1: If home_goals HIGH AND away_goals LOW THEN very_high
-        rule_fire["very_high"] = min(home_goals["high"], away_goals["low"])
+        rule_very_high = min(home_high, away_low)
         
         # Rule 2: If home_goals HIGH AND away_goals MED THEN high
-        rule_fire["high"] = max(
-            min(home_goals["high"], away_goals["med"]),
-            min(home_goals["med"], away_goals["low"]),
-            min(prob["high"], home_goals["med"])
+        rule_high = max(
+            min(home_high, away_med),
+            min(home_med, away_low),
+            min(prob["high"], home_med)
         )
         
         # Rule 3: If home_goals MED THEN medium
-        rule_fire["medium"] = max(
-            home_goals["med"],
-            min(prob["med"], home_goals["med"])
-        )
+        rule_medium = max(home_med, min(prob["med"], home_med))
         
         # Rule 4: If away_goals HIGH THEN low
-        rule_fire["low"] = min(away_goals["high"], 1 - home_goals["high"])
+        rule_low = min(away_high, 1 - home_high)
         
         # Rule 5: If away_goals HIGH AND home_goals LOW THEN very_low
-        rule_fire["very_low"] = min(away_goals["high"], home_goals["low"])
+        rule_very_low = min(away_high, home_low)
         
-        return rule_fire, consequents
-    
-    def defuzzify(self, rule_fire, consequents):
-        """Sugeno defuzzification (weighted average)"""
-        numerator = sum(rule_fire[rule] * consequents[rule] for rule in rule_fire)
-        denominator = sum(rule_fire.values())
+        # Weighted average of Sugeno consequents (crisp outputs)
+        numerator = (
+            rule_very_high * 0.85 + rule_high * 0.70 + rule_medium * 0.50
+            + rule_low * 0.30 + rule_very_low * 0.15
+        )
+        denominator = rule_very_high + rule_high + rule_medium + rule_low + rule_very_low
         
         if denominator == 0:
             return 0.5
         
         return numerator / denominator
+    
+    def infer_home_array(self, home_goals: np.ndarray, away_goals: np.ndarray, implied_prob_home: np.ndarray) -> np.ndarray:
+        """
+        Vectorized fuzzify + Sugeno rules + defuzzification for home win
+        
+        Same rule base as infer_home, written straight-line: memberships and
+        rule strengths are plain arrays instead of nested dicts.
+        """
+        a, c, inv_ba, inv_cb = self.membership_table
+        
+        # Fuzzify all 9 membership functions in one pass over an (N, 9) layout
+        x = np.repeat(np.column_stack((home_goals, away_goals, implied_prob_home)), 3, axis=1)
+        mu = np.clip(np.minimum((x - a) * inv_ba, (c - x) * inv_cb), 0.0, None)
+        home_low, home_med, home_high = mu[:, 0], mu[:, 1], mu[:, 2]
+        away_low, away_med, away_high = mu[:, 3], mu[:, 4], mu[:, 5]
+        prob_med, prob_high = mu[:, 7], mu[:, 8]
+        
+        # Rule strengths
+        rule_very_high = np.minimum(home_high, away_low)
+        rule_high = np.maximum(
+            np.maximum(np.minimum(home_high, away_med), np.minimum(home_med, away_low)),
+            np.minimum(prob_high, home_med)
+        )
+        rule_medium = np.maximum(home_med, np.minimum(prob_med, home_med))
+        rule_low = np.minimum(away_high, 1 - home_high)
+        rule_very_low = np.minimum(away_high, home_low)
+        
+        # Weighted average of Sugeno consequents, 0.5 where no rule fires
+        numerator = (
+            rule_very_high * 0.85 + rule_high * 0.70 + rule_medium * 0.50
+            + rule_low * 0.30 + rule_very_low * 0.15
+        )
+        denominator = rule_very_high + rule_high + rule_medium + rule_low + rule_very_low
+        
+        return np.where(denominator == 0, 0.5, numerator / np.where(denominator == 0, 1.0, denominator))
 
 _fuzzy_engine = FuzzyEngine()
 
+def _implied_probabilities(odds: np.ndarray) -> np.ndarray:
+    """Overround-normalized implied probabilities from decimal odds, shape (N, 3)"""
+    odds_inv = 1 / odds
+    return odds_inv / odds_inv.sum(axis=-1, keepdims=True)
+
+def _blend_with_market(p_fuzzy: np.ndarray, implied: np.ndarray) -> np.ndarray:
+    """Blend fuzzy outcome probabilities with market implied ones, shape (N, 3)"""
+    # Blend fuzzy and implied (60% fuzzy, 40% market)
+    p_final = 0.6 * p_fuzzy + 0.4 * implied
+    
+    # Normalize to sum to 1.0
+    total = p_final.sum(axis=-1, keepdims=True)
+    p_final = np.where(total > 0, p_final / np.where(total > 0, total, 1.0), 1.0 / 3.0)
+    
+    return np.clip(p_final, 0.0, 1.0)
+
 def calculate_probability(
     home_goals_avg: float,
     away_goals_avg: float,
@@ -140,14 +205,31 @@ def calculate_probability(
         Tuple of (p_home, p_draw, p_away) fuzzy probabilities
     """
     
+    # Memoized on the exact inputs: rounding them can move a fuzzy input across a
+    # membership edge and change which rules fire
+    return _calculate_probability_cached(
+        home_goals_avg,
+        away_goals_avg,
+        odds_home,
+        odds_draw,
+        odds_away
+    )
+
+@lru_cache(maxsize=16384)
+def _calculate_probability_cached(
+    home_goals_avg: float,
+    away_goals_avg: float,
+    odds_home: float,
+    odds_draw: float,
+    odds_away: float
+) -> tuple[float, float, float]:
+    """calculate_probability worker, memoized on its exact inputs"""
+    
     # Fuzzification
     fuzzy_sets = _fuzzy_engine.fuzzify(home_goals_avg, away_goals_avg, odds_home, odds_draw, odds_away)
     
-    # Rule evaluation
-    rule_fire, consequents = _fuzzy_engine.apply_rules(fuzzy_sets)
-    
-    # Defuzzification for home win
-    p_home = _fuzzy_engine.defuzzify(rule_fire, consequents)
+    # Rule evaluation and defuzzification for home win
+    p_home = _fuzzy_engine.infer_home(fuzzy_sets)
     
     # Calculate away probability (reversed logic)
     goal_diff_away = away_goals_avg - home_goals_avg
@@ -178,3 +260,38 @@ def calculate_probability(
         max(0.0, min(1.0, p_draw_final)),
         max(0.0, min(1.0, p_away_final))
     )
+
+def calculate_probability_array(
+    home_goals_avg: np.ndarray,
+    away_goals_avg: np.ndarray,
+    odds_home: np.ndarray,
+    odds_draw: np.ndarray,
+    odds_away: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized calculate_probability over arrays of matches
+    
+    Args:
+        home_goals_avg: Average goals scored by home team, shape (N,)
+        away_goals_avg: Average goals scored by away team, shape (N,)
+        odds_home: Market odds for home win, shape (N,)
+        odds_draw: Market odds for draw, shape (N,)
+        odds_away: Market odds for away win, shape (N,)
+    
+    Returns:
+        Array of shape (N, 3) with (p_home, p_draw, p_away) per match
+    """
+    
+    # Calculate implied probabilities from odds
+    implied = _implied_probabilities(np.column_stack((odds_home, odds_draw, odds_away)))
+    
+    # Fuzzy inference for home win
+    p_home = _fuzzy_engine.infer_home_array(home_goals_avg, away_goals_avg, implied[:, 0])
+    
+    # Calculate away probability (reversed logic)
+    goal_diff_away = away_goals_avg - home_goals_avg
+    p_away_base = np.clip(0.5 + (goal_diff_away * 0.15), 0.0, 1.0)
+    
+    p_fuzzy = np.column_stack((p_home, np.maximum(0.0, 1.0 - p_home - p_away_base), p_away_base))
+    
+    return _blend_with_market(p_fuzzy, implied)
@@ -10,6 +10,8 @@ TODO: INSERT YOUR HYBRID COMBINATION METHOD HERE
 - Or your custom approach
 """
 
+import numpy as np
+
 def combine_probabilities(
     p_stat: tuple[float, float, float],
     p_fuzzy: tuple[float, float, float],
@@ -57,11 +59,40 @@ def combine_probabilities(
         max(0.0, min(1.0, p_draw)),
         max(0.0, min(1.0, p_away))
     )
+
+def combine_probabilities_array(
+    p_stat: np.ndarray,
+    p_fuzzy: np.ndarray,
+    stat_confidence: float = 0.5,
+    fuzzy_confidence: float = 0.5
+) -> np.ndarray:
+    """
+    Vectorized combine_probabilities over arrays of matches
     
-    w_stat = stat_confidence / total_conf
-    w_fuzzy = fuzzy_confidence / total_conf
+    Args:
+        p_stat: Array of shape (N, 3) from statistical model
+        p_fuzzy: Array of shape (N, 3) from fuzzy logic model
+        stat_confidence: Confidence in statistical model (0-1)
+        fuzzy_confidence: Confidence in fuzzy model (0-1)
+    
+    Returns:
+        Array of shape (N, 3) with combined hybrid probabilities
+    """
     
-    # Adaptive weighted average: models with higher confidence get higher weight
-    p_hybrid = w_stat * p_stat + w_fuzzy * p_fuzzy
+    # Normalize confidences; opposite confidences that cancel out fall back to
+    # equal weights, like combine_probabilities
+    total_conf = stat_confidence + fuzzy_confidence
+    if stat_confidence == fuzzy_confidence or total_conf == 0:
+        # Equal confidence (the default): plain average
+        p_hybrid = 0.5 * (p_stat + p_fuzzy)
+    else:
+        w_stat = stat_confidence / total_conf
+        w_fuzzy = fuzzy_confidence / total_conf
+        
+        p_hybrid = w_stat * p_stat + w_fuzzy * p_fuzzy
+    
+    # Normalize to sum to 1.0
+    total = p_hybrid.sum(axis=-1, keepdims=True)
+    p_hybrid = np.where(total > 0, p_hybrid / np.where(total > 0, total, 1.0), 1.0 / 3.0)
     
-    return max(0.0, min(1.0, p_hybrid))
+    return np.clip(p_hybrid, 0.0, 1.0)
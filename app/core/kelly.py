@@ -9,6 +9,8 @@ TODO: Customize Kelly calculation if needed
 - Risk adjustments
 """
 
+import numpy as np
+
 def calculate_stake(
     probability: float,
     odds: float,
@@ -64,24 +66,54 @@ def calculate_stake(
     stake = bankroll * kelly_capped
     
     return round(kelly_capped, 4), round(stake, 2)
-    b = odds - 1  # Net odds
-    p = probability
-    q = 1 - p
+
+def calculate_fraction_array(
+    probability: np.ndarray,
+    odds: np.ndarray,
+    kelly_fraction: float = 0.5
+) -> np.ndarray:
+    """
+    Vectorized Kelly fraction of bankroll to wager, same rules as calculate_stake
     
-    # Full Kelly fraction
-    f_kelly = (b * p - q) / b
+    Args:
+        probability: Estimated win probabilities, shape (N,)
+        odds: Decimal odds offered by bookmaker, shape (N,)
+        kelly_fraction: Fraction of Kelly to use (default 0.5 for half-Kelly)
     
-    # Apply fractional Kelly multiplier
-    f_adjusted = f_kelly * kelly_fraction
+    Returns:
+        Unrounded capped Kelly fractions, 0 where no bet should be placed
+    """
     
-    # Only bet if Kelly is positive (edge exists)
-    if f_adjusted <= 0:
-        return 0.0, 0.0
+    valid = (probability > 0) & (probability < 1) & (odds > 1)
     
-    # Cap at reasonable maximum (e.g., 25% of bankroll)
-    f_adjusted = min(f_adjusted, 0.25)
+    # Kelly formula, guarding the division for rows that are masked out anyway
+    b = np.where(valid, odds - 1, 1.0)  # Net odds
+    q = 1 - probability  # Loss probability
+    full_kelly = (probability * b - q) / b
+    
+    # Apply Kelly fraction multiplier, cap at 5% of bankroll per bet
+    kelly = np.clip(full_kelly * kelly_fraction, 0.0, 0.05)
+    
+    return np.where(valid, kelly, 0.0)
+
+def calculate_stake_array(
+    probability: np.ndarray,
+    odds: np.ndarray,
+    bankroll,
+    kelly_fraction: float = 0.5
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized calculate_stake over arrays of bets
     
-    # Calculate stake amount
-    stake = bankroll * f_adjusted
+    Args:
+        probability: Estimated win probabilities, shape (N,)
+        odds: Decimal odds offered by bookmaker, shape (N,)
+        bankroll: Bankroll per bet, scalar or shape (N,)
+        kelly_fraction: Fraction of Kelly to use (default 0.5 for half-Kelly)
+    
+    Returns:
+        Tuple of (kelly_fractions, stakes) arrays, unrounded
+    """
     
-    return f_adjusted, stake
+    kelly = calculate_fraction_array(probability, odds, kelly_fraction)
+    return kelly, bankroll * kelly
@@ -11,12 +11,42 @@ TODO: INSERT YOUR STATISTICAL MODEL HERE
 """
 
 import math
+from functools import lru_cache
 
-def _poisson_probability(k: float, lambda_: float) -> float:
-    """Calculate Poisson probability P(X=k)"""
-    if lambda_ <= 0:
-        return 0.0
-    return (math.exp(-lambda_) * (lambda_ ** k)) / math.factorial(int(k))
+import numpy as np
+
+# Scorelines are truncated at 0..5 goals per side
+_GOALS = np.arange(6)
+_INV_FACT = 1.0 / np.array([1, 1, 2, 6, 24, 120], dtype=np.float64)
+_INV_FACT_LIST = _INV_FACT.tolist()
+
+# Home/draw/away masks over the (home_goals, away_goals) scoreline grid, shape (3, 6, 6)
+_HOME_MASK = np.tri(6, 6, -1)
+_OUTCOME_MASKS = np.stack((_HOME_MASK, np.eye(6), _HOME_MASK.T))
+
+def _poisson_pmf(lambda_):
+    """Poisson P(X=k) for k=0..5; shape (6,) for a scalar rate, (N, 6) for an array of rates"""
+    lambda_ = np.asarray(lambda_, dtype=np.float64)[..., np.newaxis]
+    return (np.exp(-lambda_) * _INV_FACT) * lambda_ ** _GOALS
+
+def _poisson_pmf_list(lambda_: float) -> list[float]:
+    """Poisson P(X=k) for k=0..5 as plain floats, for the scalar path"""
+    exp_neg = math.exp(-lambda_)
+    return [exp_neg * inv_fact * lambda_ ** k for k, inv_fact in enumerate(_INV_FACT_LIST)]
+
+def _blend_with_rates(p_poisson: np.ndarray, rates: np.ndarray) -> np.ndarray:
+    """Blend Poisson outcome probabilities with historical rates, shape (N, 3)"""
+    # Blend with historical win rates (60-40 split)
+    p_hybrid = 0.6 * p_poisson + 0.4 * rates
+    
+    # Normalize to sum to 1.0
+    total = p_hybrid.sum(axis=-1, keepdims=True)
+    p_hybrid = np.where(total > 0, p_hybrid / np.where(total > 0, total, 1.0), 1.0 / 3.0)
+    
+    # Apply market skepticism adjustment (regress towards uniform 1/3)
+    p_final = 0.7 * p_hybrid + 0.3 * (1.0 / 3.0)
+    
+    return np.clip(p_final, 0.0, 1.0)
 
 def _calculate_home_advantage() -> float:
     """Home advantage factor (typical ~1.15 multiplier on goals)"""
@@ -41,6 +71,23 @@ def calculate_probability(
         Tuple of (p_home, p_draw, p_away) probabilities
     """
     
+    # Memoized on the exact inputs, so results match calculate_probability_array
+    return _calculate_probability_cached(
+        home_goals_avg,
+        away_goals_avg,
+        home_win_rate,
+        away_win_rate
+    )
+
+@lru_cache(maxsize=16384)
+def _calculate_probability_cached(
+    home_goals_avg: float,
+    away_goals_avg: float,
+    home_win_rate: float,
+    away_win_rate: float
+) -> tuple[float, float, float]:
+    """calculate_probability worker, memoized on its exact inputs"""
+    
     # Ensure valid inputs
     home_goals_avg = max(0.1, min(home_goals_avg, 5.0))
     away_goals_avg = max(0.1, min(away_goals_avg, 5.0))
@@ -51,23 +98,20 @@ def calculate_probability(
     home_advantage = _calculate_home_advantage()
     adj_home_goals = home_goals_avg * home_advantage
     
-    # Calculate all outcomes using Poisson
+    # Calculate all outcomes using Poisson; plain floats, cheaper than NumPy at this size
+    pmf_home = _poisson_pmf_list(adj_home_goals)
+    pmf_away = _poisson_pmf_list(away_goals_avg)
     p_home_poisson = 0.0
     p_draw_poisson = 0.0
     p_away_poisson = 0.0
+    away_below = 0.0  # P(away_goals < home_goals) within the 0..5 grid
+    away_total = sum(pmf_away)
     
-    for home_goals in range(6):
-        p_home = _poisson_probability(home_goals, adj_home_goals)
-        
-        for away_goals in range(6):
-            p_away = _poisson_probability(away_goals, away_goals_avg)
-            
-            if home_goals > away_goals:
-                p_home_poisson += p_home * p_away
-            elif home_goals == away_goals:
-                p_draw_poisson += p_home * p_away
-            else:
-                p_away_poisson += p_home * p_away
+    for p_home, p_away in zip(pmf_home, pmf_away):
+        p_home_poisson += p_home * away_below
+        p_draw_poisson += p_home * p_away
+        away_below += p_away
+        p_away_poisson += p_home * (away_total - away_below)
     
     # Blend with historical win rates (60-40 split)
     draw_rate = max(0.1, 1.0 - home_win_rate - away_win_rate)
@@ -94,3 +138,40 @@ def calculate_probability(
         max(0.0, min(1.0, p_draw_final)),
         max(0.0, min(1.0, p_away_final))
     )
+
+def calculate_probability_array(
+    home_goals_avg: np.ndarray,
+    away_goals_avg: np.ndarray,
+    home_win_rate: np.ndarray,
+    away_win_rate: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized calculate_probability over arrays of matches
+    
+    Args:
+        home_goals_avg: Average goals scored by home team, shape (N,)
+        away_goals_avg: Average goals scored by away team, shape (N,)
+        home_win_rate: Historical win rate for home team, shape (N,)
+        away_win_rate: Historical win rate for away team, shape (N,)
+    
+    Returns:
+        Array of shape (N, 3) with (p_home, p_draw, p_away) per match
+    """
+    
+    # Ensure valid inputs
+    home_goals_avg = np.clip(home_goals_avg, 0.1, 5.0)
+    away_goals_avg = np.clip(away_goals_avg, 0.1, 5.0)
+    home_win_rate = np.clip(home_win_rate, 0.01, 0.99)
+    away_win_rate = np.clip(away_win_rate, 0.01, 0.99)
+    
+    # Apply home advantage to expected goals
+    adj_home_goals = home_goals_avg * _calculate_home_advantage()
+    
+    # Calculate all outcomes using Poisson
+    pmf_home = _poisson_pmf(adj_home_goals)
+    pmf_away = _poisson_pmf(away_goals_avg)
+    p_poisson = np.einsum('ni,nj,kij->nk', pmf_home, pmf_away, _OUTCOME_MASKS)
+    
+    draw_rate = np.maximum(0.1, 1.0 - home_win_rate - away_win_rate)
+    
+    return _blend_with_rates(p_poisson, np.column_stack((home_win_rate, draw_rate, away_win_rate)))
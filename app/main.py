@@ -1,17 +1,87 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import Depends, FastAPI, File, UploadFile, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from app.schemas import PredictionRequest, PredictionResponse, BacktestResponse, ExperimentCreate, Experiment
+from fastapi.responses import ORJSONResponse
+from app.schemas import (
+    PredictionRequest, PredictionResponse, PredictionBatchRequest, PredictionBatchResponse,
+    BacktestResponse, ExperimentCreate, Experiment,
+    PREDICTION_RESPONSE_ADAPTER, PREDICTION_BATCH_RESPONSE_ADAPTER, BACKTEST_RESPONSE_ADAPTER,
+    EXPERIMENT_LIST_ADAPTER, OUTCOMES
+)
 from app.core import fuzzy_engine, stat_engine, hybrid_engine, kelly, backtester
+from app.validators import validate_prediction_request
 import uuid
-from datetime import datetime
-from typing import List
+from datetime import datetime, timezone
+from typing import Annotated, Optional
 import os
 import csv
+import tempfile
+import asyncio
+import multiprocessing
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+import orjson
+
+# Upper bound on backtest worker processes; each one holds a parsed upload in memory
+_MAX_BACKTEST_WORKERS = 4
+
+def _available_cpus() -> int:
+    """CPUs this process may actually use: affinity mask, capped by a cgroup v2 CPU quota"""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, -(-int(quota) // int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    """
+    Start method for backtest workers
+    
+    Workers start on demand, after the server already runs threads (the pool's
+    manager thread, the threadpool behind UploadFile.read), and forking a
+    multithreaded process can deadlock. A forkserver forks them from a clean
+    single-threaded process that has the backtester preloaded; platforms
+    without one use spawn.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["app.core.backtester"])
+    return context
+
+def _new_executor() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=min(_available_cpus(), _MAX_BACKTEST_WORKERS),
+        mp_context=_worker_context()
+    )
+
+# Backtests are CPU-bound; run them in worker processes so they never block the event loop.
+# Created at startup rather than import, so processes that merely import this module
+# (the forkserver among them) never build a pool; rebuilt by /backtest if a worker dies
+# (e.g. killed for running out of memory).
+_executor: Optional[ProcessPoolExecutor] = None
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    global _executor
+    
+    _executor = _new_executor()
+    yield
+    _executor.shutdown(cancel_futures=True)
 
 app = FastAPI(
     title="Sports Betting Prediction API",
     description="Hybrid statistical and fuzzy logic prediction system for sports betting",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=_lifespan
 )
 
 origins = [
@@ -32,18 +102,77 @@ app.add_middleware(
 
 
 uploaded_data = None
-experiments_db: List[Experiment] = []
+experiments_db: list[Experiment] = []
+
+# Serialized experiments_db, rebuilt on the first read after a save
+_experiments_json: Optional[bytes] = None
+
+# Request example shown in the OpenAPI docs for /predict
+_PREDICT_EXAMPLE = {
+    "home_goals_avg": 1.5,
+    "away_goals_avg": 1.2,
+    "home_win_rate": 0.55,
+    "away_win_rate": 0.45,
+    "odds": [2.0, 3.5, 3.8],
+    "bankroll": 1000,
+    "kelly_fraction": 0.5
+}
+
+# /predict validates its body itself, so document it explicitly
+_PREDICT_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": PredictionRequest.model_json_schema(),
+                "example": _PREDICT_EXAMPLE
+            }
+        }
+    }
+}
+
+# Mode for uploaded files: what open() would create under the process umask.
+# mkstemp always creates 0600, so uploads are chmod-ed to this before being moved into place.
+_UPLOAD_UMASK = os.umask(0)
+os.umask(_UPLOAD_UMASK)
+_UPLOAD_FILE_MODE = 0o666 & ~_UPLOAD_UMASK
+
+# Points kept in the equity curve embedded in /backtest responses
+_CURVE_SAMPLE_POINTS = 256
+
+# Full equity curves served by /backtest/{id}/curve, least recently used first
+_MAX_STORED_CURVES = 16
+_backtest_curves: "OrderedDict[str, np.ndarray]" = OrderedDict()
 
 @app.get("/")
 async def read_root():
     return {
         "message": "Sports Betting Prediction API",
         "version": "1.0.0",
-        "endpoints": ["/predict", "/upload-data", "/backtest", "/experiments", "/save-experiment"]
+        "endpoints": ["/predict", "/predict_batch", "/upload-data", "/backtest", "/backtest/{backtest_id}/curve", "/experiments", "/save-experiment"]
     }
 
-@app.post("/predict", response_model=PredictionResponse)
-async def predict(request: PredictionRequest):
+async def _prediction_request(http_request: Request) -> PredictionRequest:
+    """
+    Parse the /predict body with orjson and check it with the inlined validator
+    
+    The payload is fully checked, so the model is built without pydantic validation.
+    Failures are reported as 422, like pydantic validation errors.
+    """
+    body = await http_request.body()
+    try:
+        data = orjson.loads(body)
+        validate_prediction_request(data)
+    except ValueError as e:  # Includes orjson.JSONDecodeError
+        raise RequestValidationError(
+            [{"type": "value_error", "loc": ("body",), "msg": str(e), "input": body.decode("utf-8", "replace")}]
+        )
+    
+    data["odds"] = tuple(data["odds"])
+    return PredictionRequest.model_construct(**data)
+
+@app.post("/predict", response_model=PredictionResponse, openapi_extra=_PREDICT_OPENAPI)
+async def predict(request: Annotated[PredictionRequest, Depends(_prediction_request)]):
     """
     Generate predictions using hybrid model (statistical + fuzzy logic)
     for all three outcomes: home win, draw, and away win
@@ -69,42 +198,26 @@ async def predict(request: PredictionRequest):
         p_fuzzy = fuzzy_engine.calculate_probability(
             request.home_goals_avg,
             request.away_goals_avg,
-            request.odds_home,
-            request.odds_draw,
-            request.odds_away
+            *request.odds
         )
         
         # Combine using hybrid engine for all outcomes
         p_hybrid = hybrid_engine.combine_probabilities(p_stat, p_fuzzy)
         
         # Find best betting opportunity (highest edge)
-        total_odds_inv = 1/request.odds_home + 1/request.odds_draw + 1/request.odds_away
-        implied_home = (1/request.odds_home) / total_odds_inv
-        implied_draw = (1/request.odds_draw) / total_odds_inv
-        implied_away = (1/request.odds_away) / total_odds_inv
-        
-        # Edge = probability - implied_probability
-        edges = {
-            "home": p_hybrid[0] - implied_home,
-            "draw": p_hybrid[1] - implied_draw,
-            "away": p_hybrid[2] - implied_away
-        }
+        odds_inv = [1/odds for odds in request.odds]
+        total_odds_inv = sum(odds_inv)
+        
+        # Edge = probability - implied_probability, in OUTCOMES order
+        edges = [p - inv / total_odds_inv for p, inv in zip(p_hybrid, odds_inv)]
         
         # Select best outcome
-        best_outcome = max(edges, key=edges.get)
+        best = max(range(3), key=edges.__getitem__)
+        best_outcome = OUTCOMES[best]
         
         # Get odds and probability for best outcome
-        best_odds = {
-            "home": request.odds_home,
-            "draw": request.odds_draw,
-            "away": request.odds_away
-        }[best_outcome]
-        
-        best_probability = p_hybrid[
-            0 if best_outcome == "home" else 
-            1 if best_outcome == "draw" else 
-            2
-        ]
+        best_odds = request.odds[best]
+        best_probability = p_hybrid[best]
         
         # Calculate Kelly criterion and recommended stake for best outcome
         kelly_fraction, recommended_stake = kelly.calculate_stake(
@@ -114,7 +227,8 @@ async def predict(request: PredictionRequest):
             request.kelly_fraction
         )
         
-        return PredictionResponse(
+        # Values are computed and range-checked by the engines; skip re-validation
+        response = PredictionResponse.model_construct(
             p_stat_home=round(p_stat[0], 4),
             p_stat_draw=round(p_stat[1], 4),
             p_stat_away=round(p_stat[2], 4),
@@ -128,6 +242,69 @@ async def predict(request: PredictionRequest):
             recommended_stake=recommended_stake,
             recommended_outcome=best_outcome
         )
+        return Response(PREDICTION_RESPONSE_ADAPTER.dump_json(response), media_type="application/json")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+@app.post("/predict_batch", response_model=PredictionBatchResponse)
+async def predict_batch(request: PredictionBatchRequest):
+    """
+    Generate /predict results for many matches in one vectorized pass
+    """
+    try:
+        # Converted once during validation
+        home_goals_avg, away_goals_avg, home_win_rate, away_win_rate, odds = request.match_arrays()
+        
+        # Validate inputs
+        if (home_goals_avg < 0).any() or (away_goals_avg < 0).any():
+            raise ValueError("Goals average cannot be negative")
+        if not ((0 < home_win_rate) & (home_win_rate < 1)).all():
+            raise ValueError("Home win rate must be between 0 and 1")
+        if not ((0 < away_win_rate) & (away_win_rate < 1)).all():
+            raise ValueError("Away win rate must be between 0 and 1")
+        
+        # Same engines as /predict, vectorized like the backtester
+        p_stat = stat_engine.calculate_probability_array(
+            home_goals_avg, away_goals_avg, home_win_rate, away_win_rate
+        )
+        p_fuzzy = fuzzy_engine.calculate_probability_array(
+            home_goals_avg, away_goals_avg, odds[:, 0], odds[:, 1], odds[:, 2]
+        )
+        p_hybrid = hybrid_engine.combine_probabilities_array(p_stat, p_fuzzy)
+        
+        # Best outcome per match by edge = probability - implied_probability
+        odds_inv = 1 / odds
+        edges = p_hybrid - odds_inv / odds_inv.sum(axis=1, keepdims=True)
+        best = edges.argmax(axis=1)
+        rows = np.arange(len(best))
+        
+        kelly_fraction, recommended_stake = kelly.calculate_stake_array(
+            p_hybrid[rows, best],
+            odds[rows, best],
+            request.bankroll,
+            request.kelly_fraction
+        )
+        
+        p_stat = np.round(p_stat, 4)
+        p_fuzzy = np.round(p_fuzzy, 4)
+        p_hybrid = np.round(p_hybrid, 4)
+        
+        # Engine output, as in /predict; the arrays are serialized without re-validation
+        response = PredictionBatchResponse.model_construct(
+            p_stat_home=p_stat[:, 0],
+            p_stat_draw=p_stat[:, 1],
+            p_stat_away=p_stat[:, 2],
+            p_fuzzy_home=p_fuzzy[:, 0],
+            p_fuzzy_draw=p_fuzzy[:, 1],
+            p_fuzzy_away=p_fuzzy[:, 2],
+            p_hybrid_home=p_hybrid[:, 0],
+            p_hybrid_draw=p_hybrid[:, 1],
+            p_hybrid_away=p_hybrid[:, 2],
+            kelly_fraction=np.round(kelly_fraction, 4),
+            recommended_stake=np.round(recommended_stake, 2),
+            recommended_outcome=tuple(OUTCOMES[i] for i in best.tolist())
+        )
+        return Response(PREDICTION_BATCH_RESPONSE_ADAPTER.dump_json(response), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
@@ -157,25 +334,34 @@ async def upload_data(file: UploadFile = File(...)):
         safe_filename = "".join(c for c in file.filename if c.isalnum() or c in ('-', '_', '.'))
         file_path = os.path.join(upload_dir, safe_filename)
         
-        # Write and validate file
-        content = await file.read()
-        file_size = len(content)
-        
-        if file_size > max_size:
-            raise HTTPException(status_code=413, detail=f"File too large. Max {max_size / 1024 / 1024}MB")
-        
-        if file_size == 0:
-            raise HTTPException(status_code=400, detail="File is empty")
-        
-        # Write file
-        with open(file_path, "wb") as f:
-            f.write(content)
-        
-        # Validate CSV structure
-        with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            if reader.fieldnames is None:
-                raise HTTPException(status_code=400, detail="Invalid CSV format")
+        # Stream to a temp file next to the target in 1 MiB chunks, enforcing the size
+        # limit as we go; an existing upload is only replaced once every check passes
+        fd, tmp_path = tempfile.mkstemp(dir=upload_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while chunk := await file.read(1 << 20):
+                    file_size += len(chunk)
+                    if file_size > max_size:
+                        break
+                    f.write(chunk)
+            
+            if file_size > max_size:
+                raise HTTPException(status_code=413, detail=f"File too large. Max {max_size / 1024 / 1024}MB")
+            
+            if file_size == 0:
+                raise HTTPException(status_code=400, detail="File is empty")
+            
+            # Validate CSV structure
+            with open(tmp_path, 'r', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                if reader.fieldnames is None:
+                    raise HTTPException(status_code=400, detail="Invalid CSV format")
+
+            os.chmod(tmp_path, _UPLOAD_FILE_MODE)
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
         
         uploaded_data = file_path
         
@@ -189,6 +375,12 @@ async def upload_data(file: UploadFile = File(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload error: {str(e)}")
 
+def _sample_curve(curve: np.ndarray, points: int = _CURVE_SAMPLE_POINTS) -> np.ndarray:
+    """Evenly spaced subset of at most `points` values, keeping the first and last"""
+    if len(curve) <= points:
+        return curve
+    return curve[np.linspace(0, len(curve) - 1, points).round().astype(np.intp)]
+
 @app.post("/backtest", response_model=BacktestResponse)
 async def run_backtest():
     """
@@ -201,44 +393,84 @@ async def run_backtest():
     - Track equity curve
     - Compute performance metrics
     """
-    global uploaded_data
+    global uploaded_data, _executor
     
     if not uploaded_data:
         raise HTTPException(status_code=400, detail="No data uploaded. Please upload a CSV file first.")
     
     try:
-        # Placeholder backtest logic
-        result = await backtester.run_backtest(uploaded_data)
+        loop = asyncio.get_running_loop()
+        executor = _executor
+        try:
+            result = await loop.run_in_executor(executor, backtester.run_backtest_sync, uploaded_data)
+        except BrokenProcessPool:
+            # A dead worker breaks the whole pool; replace it once so later requests work
+            if _executor is executor:
+                _executor = _new_executor()
+                executor.shutdown(wait=False)
+            raise HTTPException(status_code=503, detail="Backtest worker crashed, please retry")
+        
+        # Keep the full curve for /backtest/{id}/curve; the response only embeds a sample
+        backtest_id = str(uuid.uuid4())
+        equity_curve = result["equity_curve"]
+        _backtest_curves[backtest_id] = equity_curve
+        while len(_backtest_curves) > _MAX_STORED_CURVES:
+            _backtest_curves.popitem(last=False)
         
-        return BacktestResponse(
+        # Trusted backtester output; skips per-element validation of the curve
+        response = BacktestResponse.model_construct(
             roi=result["roi"],
             total_bets=result["total_bets"],
             winning_bets=result["winning_bets"],
             losing_bets=result["losing_bets"],
-            equity_curve=result["equity_curve"],
+            equity_curve_sample=_sample_curve(equity_curve),
+            full_curve_url=f"/backtest/{backtest_id}/curve",
             final_bankroll=result["final_bankroll"]
         )
+        return Response(BACKTEST_RESPONSE_ADAPTER.dump_json(response), media_type="application/json")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Backtest error: {str(e)}")
 
-@app.get("/experiments", response_model=List[Experiment])
+@app.get("/backtest/{backtest_id}/curve")
+async def get_backtest_curve(backtest_id: str):
+    """
+    Full equity curve of a recent backtest as raw little-endian float32 values
+    """
+    equity_curve = _backtest_curves.get(backtest_id)
+    if equity_curve is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired backtest id")
+    _backtest_curves.move_to_end(backtest_id)
+    
+    return Response(equity_curve.astype("<f4").tobytes(), media_type="application/octet-stream")
+
+@app.get("/experiments", response_model=list[Experiment])
 async def get_experiments():
     """
     Retrieve all saved experiments
     """
-    return experiments_db
+    global _experiments_json
+    
+    if _experiments_json is None:
+        _experiments_json = EXPERIMENT_LIST_ADAPTER.dump_json(experiments_db)
+    return Response(_experiments_json, media_type="application/json")
 
 @app.post("/save-experiment", response_model=Experiment)
 async def save_experiment(experiment: ExperimentCreate):
     """
     Save experiment results
     """
-    new_experiment = Experiment(
+    global _experiments_json
+    
+    # The payload was already validated as ExperimentCreate; id and date are server-generated
+    new_experiment = Experiment.model_construct(
         id=str(uuid.uuid4()),
-        date=datetime.now().isoformat(),
-        **experiment.dict()
+        date=datetime.now(timezone.utc),
+        **experiment.model_dump()
     )
     experiments_db.append(new_experiment)
+    _experiments_json = None  # Invalidate the cached /experiments payload
     return new_experiment
 
 if __name__ == "__main__":
@@ -1,68 +1,268 @@
-from pydantic import BaseModel, Field
-from typing import List
+import sys
+from datetime import datetime
+from annotated_types import Ge, Le, MaxLen
+from pydantic import (
+    BaseModel, ConfigDict, PlainSerializer, PrivateAttr, Strict, StringConstraints, TypeAdapter, field_serializer,
+    model_validator
+)
+from itertools import chain
+from typing import Annotated, Literal, Optional
+import numpy as np
+from app.validators import prediction_in_range, prediction_in_range_array, prediction_range_failures
+
+def _float_list(values) -> list[float]:
+    """Serialize a float sequence, converting NumPy arrays in one tolist() call"""
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+# Float sequence that may hold a NumPy array when constructed from trusted engine output
+FloatSeries = Annotated[tuple[float, ...], PlainSerializer(_float_list, return_type=list[float])]
+
+# Outcome labels in engine column order (home, draw, away), interned once at import
+OUTCOMES = tuple(sys.intern(outcome) for outcome in ("home", "draw", "away"))
+
+# Request number: a JSON int or float, never a numeric string or bool, matching
+# validate_prediction_request so /predict, /predict_batch and model_validate agree
+Number = Annotated[float, Strict()]
+
+# Matches per /predict_batch request; keeps one body from holding the event loop
+MAX_BATCH_MATCHES = 10_000
+MatchSeries = Annotated[list[Number], MaxLen(MAX_BATCH_MATCHES)]
+MatchOdds = Annotated[list[tuple[Number, Number, Number]], MaxLen(MAX_BATCH_MATCHES)]
+
+# Float in [0, 1]; both bounds fold into the one float validator
+Probability = Annotated[float, Ge(0), Le(1)]
+
+# Bounded experiment strings; length and stripping are enforced by pydantic-core
+ModelName = Annotated[str, StringConstraints(max_length=64, strip_whitespace=True)]
+Notes = Annotated[str, StringConstraints(max_length=1024)]
+
+# Shared by every API model: immutable, strict about unknown keys, and never
+# re-validating model instances or trusted defaults
+_MODEL_CONFIG = ConfigDict(
+    frozen=True,
+    extra='forbid',
+    revalidate_instances='never',
+    validate_default=False
+)
 
 class PredictionRequest(BaseModel):
-    home_goals_avg: float = Field(..., description="Average goals scored by home team")
-    away_goals_avg: float = Field(..., description="Average goals scored by away team")
-    home_win_rate: float = Field(..., ge=0, le=1, description="Home team win rate")
-    away_win_rate: float = Field(..., ge=0, le=1, description="Away team win rate")
-    odds_home: float = Field(..., gt=1, description="Betting odds for home win")
-    odds_draw: float = Field(..., gt=1, description="Betting odds for draw")
-    odds_away: float = Field(..., gt=1, description="Betting odds for away win")
-    bankroll: float = Field(..., gt=0, description="Total bankroll available")
-    kelly_fraction: float = Field(default=0.5, ge=0, le=1, description="Kelly fraction multiplier")
-
-    class Config:
-        json_schema_extra= {
-            "example": {
-                "home_goals_avg": 1.5,
-                "away_goals_avg": 1.2,
-                "home_win_rate": 0.55,
-                "away_win_rate": 0.45,
-                "odds_home": 2.0,
-                "odds_draw": 3.5,
-                "odds_away": 3.8,
-                "bankroll": 1000,
-                "kelly_fraction": 0.5
-            }
-        }
+    """
+    Match inputs for a single prediction
+    
+    Attributes:
+        home_goals_avg: Average goals scored by home team
+        away_goals_avg: Average goals scored by away team
+        home_win_rate: Home team win rate (0 to 1)
+        away_win_rate: Away team win rate (0 to 1)
+        odds: Betting odds for (home win, draw, away win), each > 1
+        bankroll: Total bankroll available (> 0)
+        kelly_fraction: Kelly fraction multiplier (0 to 1)
+    """
+    model_config = _MODEL_CONFIG
+
+    home_goals_avg: Number
+    away_goals_avg: Number
+    home_win_rate: Number
+    away_win_rate: Number
+    odds: tuple[Number, Number, Number]
+    bankroll: Number
+    kelly_fraction: Number = 0.5
+
+    @model_validator(mode='after')
+    def _check_ranges(self) -> "PredictionRequest":
+        """All numeric bounds in one flat predicate instead of a validator per field"""
+        ranges = (self.home_win_rate, self.away_win_rate, self.odds, self.bankroll, self.kelly_fraction)
+        if prediction_in_range(*ranges):
+            return self
+        
+        # Slow path: only reached for invalid payloads, so name what failed
+        raise ValueError(f"Out of range: {', '.join(prediction_range_failures(*ranges))}")
 
 class PredictionResponse(BaseModel):
+    """
+    Outcome probabilities from each model and the recommended bet
+    
+    Attributes:
+        p_stat_home, p_stat_draw, p_stat_away: Statistical model probabilities
+        p_fuzzy_home, p_fuzzy_draw, p_fuzzy_away: Fuzzy logic model probabilities
+        p_hybrid_home, p_hybrid_draw, p_hybrid_away: Hybrid combined probabilities
+        kelly_fraction: Optimal Kelly fraction
+        recommended_stake: Recommended stake amount
+        recommended_outcome: Recommended bet: 'home', 'draw', or 'away'
+    """
+    model_config = _MODEL_CONFIG
+
     # Statistical model probabilities
-    p_stat_home: float = Field(..., ge=0, le=1, description="Statistical probability - home win")
-    p_stat_draw: float = Field(..., ge=0, le=1, description="Statistical probability - draw")
-    p_stat_away: float = Field(..., ge=0, le=1, description="Statistical probability - away win")
+    p_stat_home: Probability
+    p_stat_draw: Probability
+    p_stat_away: Probability
     
     # Fuzzy logic model probabilities
-    p_fuzzy_home: float = Field(..., ge=0, le=1, description="Fuzzy logic probability - home win")
-    p_fuzzy_draw: float = Field(..., ge=0, le=1, description="Fuzzy logic probability - draw")
-    p_fuzzy_away: float = Field(..., ge=0, le=1, description="Fuzzy logic probability - away win")
+    p_fuzzy_home: Probability
+    p_fuzzy_draw: Probability
+    p_fuzzy_away: Probability
     
     # Hybrid combined probabilities
-    p_hybrid_home: float = Field(..., ge=0, le=1, description="Hybrid combined probability - home win")
-    p_hybrid_draw: float = Field(..., ge=0, le=1, description="Hybrid combined probability - draw")
-    p_hybrid_away: float = Field(..., ge=0, le=1, description="Hybrid combined probability - away win")
+    p_hybrid_home: Probability
+    p_hybrid_draw: Probability
+    p_hybrid_away: Probability
     
     # Recommendation
-    kelly_fraction: float = Field(..., description="Optimal Kelly fraction")
-    recommended_stake: float = Field(..., description="Recommended stake amount")
-    recommended_outcome: str = Field(..., description="Recommended bet: 'home', 'draw', or 'away'")
+    kelly_fraction: float
+    recommended_stake: float
+    recommended_outcome: Literal['home', 'draw', 'away']
+
+class PredictionBatchRequest(BaseModel):
+    """
+    Match inputs for many predictions, one list per field (index i is match i)
+    
+    Attributes:
+        home_goals_avg: Average goals scored by home team
+        away_goals_avg: Average goals scored by away team
+        home_win_rate: Home team win rate (0 to 1)
+        away_win_rate: Away team win rate (0 to 1)
+        odds: Betting odds for (home win, draw, away win), each > 1
+        bankroll: Total bankroll available (> 0), shared by every match
+        kelly_fraction: Kelly fraction multiplier (0 to 1), shared by every match
+    """
+    model_config = _MODEL_CONFIG
+
+    home_goals_avg: MatchSeries
+    away_goals_avg: MatchSeries
+    home_win_rate: MatchSeries
+    away_win_rate: MatchSeries
+    odds: MatchOdds
+    bankroll: Number
+    kelly_fraction: Number = 0.5
+
+    # Match columns as float64 arrays, built once by _check_batch and reused by the handler
+    _match_arrays: Optional[tuple[np.ndarray, ...]] = PrivateAttr(default=None)
+
+    def match_arrays(self) -> tuple[np.ndarray, ...]:
+        """(home_goals_avg, away_goals_avg, home_win_rate, away_win_rate, odds) as float64 arrays"""
+        if self._match_arrays is None:
+            n = len(self.odds)
+            self._match_arrays = (
+                np.asarray(self.home_goals_avg, dtype=np.float64),
+                np.asarray(self.away_goals_avg, dtype=np.float64),
+                np.asarray(self.home_win_rate, dtype=np.float64),
+                np.asarray(self.away_win_rate, dtype=np.float64),
+                # Far quicker than np.asarray on a list of tuples
+                np.fromiter(chain.from_iterable(self.odds), np.float64, count=3 * n).reshape(n, 3)
+            )
+        return self._match_arrays
+
+    @model_validator(mode='after')
+    def _check_batch(self) -> "PredictionBatchRequest":
+        """All lists must have the same, non-zero length and respect PredictionRequest's bounds"""
+        n = len(self.home_goals_avg)
+        columns = (
+            self.away_goals_avg, self.home_win_rate, self.away_win_rate, self.odds
+        )
+        if n == 0 or any(len(values) != n for values in columns):
+            raise ValueError("All match lists must be non-empty and of the same length")
+        
+        # PredictionRequest's bounds, checked for every match in one vectorized pass
+        _, _, home_win_rate, away_win_rate, odds = self.match_arrays()
+        in_range = prediction_in_range_array(
+            home_win_rate, away_win_rate, odds, self.bankroll, self.kelly_fraction
+        )
+        if in_range.all():
+            return self
+        
+        # Slow path: name what failed for the first bad match
+        i = int(in_range.argmin())
+        failed = prediction_range_failures(
+            self.home_win_rate[i], self.away_win_rate[i], self.odds[i], self.bankroll, self.kelly_fraction
+        )
+        raise ValueError(f"Out of range at index {i}: {', '.join(failed)}")
+
+class PredictionBatchResponse(BaseModel):
+    """
+    PredictionResponse fields as parallel lists, index i answering match i
+    """
+    model_config = _MODEL_CONFIG
+
+    # Statistical model probabilities
+    p_stat_home: FloatSeries
+    p_stat_draw: FloatSeries
+    p_stat_away: FloatSeries
+    
+    # Fuzzy logic model probabilities
+    p_fuzzy_home: FloatSeries
+    p_fuzzy_draw: FloatSeries
+    p_fuzzy_away: FloatSeries
+    
+    # Hybrid combined probabilities
+    p_hybrid_home: FloatSeries
+    p_hybrid_draw: FloatSeries
+    p_hybrid_away: FloatSeries
+    
+    # Recommendation
+    kelly_fraction: FloatSeries
+    recommended_stake: FloatSeries
+    recommended_outcome: tuple[Literal['home', 'draw', 'away'], ...]
 
 class BacktestResponse(BaseModel):
-    roi: float = Field(..., description="Return on investment percentage")
-    total_bets: int = Field(..., description="Total number of bets placed")
-    winning_bets: int = Field(..., description="Number of winning bets")
-    losing_bets: int = Field(..., description="Number of losing bets")
-    equity_curve: List[float] = Field(..., description="Bankroll progression over time")
-    final_bankroll: float = Field(..., description="Final bankroll amount")
+    """
+    Backtest performance metrics
+    
+    Attributes:
+        roi: Return on investment percentage
+        total_bets: Total number of bets placed
+        winning_bets: Number of winning bets
+        losing_bets: Number of losing bets
+        equity_curve_sample: Bankroll progression over time, down-sampled to at
+            most 256 evenly spaced points (first and last included)
+        full_curve_url: Path of the full equity curve as little-endian float32 bytes
+        final_bankroll: Final bankroll amount
+    """
+    model_config = _MODEL_CONFIG
+
+    roi: float
+    total_bets: int
+    winning_bets: int
+    losing_bets: int
+    equity_curve_sample: FloatSeries
+    full_curve_url: str
+    final_bankroll: float
 
 class ExperimentCreate(BaseModel):
-    model_name: str = Field(..., description="Name/version of the model")
-    roi: float = Field(..., description="Return on investment achieved")
-    accuracy: float = Field(..., ge=0, le=1, description="Prediction accuracy")
-    kelly_fraction: float = Field(..., ge=0, le=1, description="Kelly fraction used")
-    notes: str = Field(default="", description="Additional notes about the experiment")
+    """
+    Experiment results submitted by the client
+    
+    Attributes:
+        model_name: Name/version of the model (at most 64 characters, stripped)
+        roi: Return on investment achieved
+        accuracy: Prediction accuracy (0 to 1)
+        kelly_fraction: Kelly fraction used (0 to 1)
+        notes: Additional notes about the experiment (at most 1024 characters)
+    """
+    model_config = _MODEL_CONFIG
+
+    model_name: ModelName
+    roi: float
+    accuracy: Probability
+    kelly_fraction: Probability
+    notes: Notes = ""
 
 class Experiment(ExperimentCreate):
-    id: str = Field(..., description="Unique experiment identifier")
-    date: str = Field(..., description="Date of experiment")
+    """
+    Saved experiment
+    
+    Attributes:
+        id: Unique experiment identifier
+        date: Date of experiment, serialized as Unix epoch seconds
+    """
+    id: str
+    date: datetime
+
+    @field_serializer('date')
+    def _serialize_date(self, value: datetime) -> int:
+        return int(value.timestamp())
+
+# Prebuilt serializers, reused instead of being resolved per call
+PREDICTION_RESPONSE_ADAPTER = TypeAdapter(PredictionResponse)
+PREDICTION_BATCH_RESPONSE_ADAPTER = TypeAdapter(PredictionBatchResponse)
+BACKTEST_RESPONSE_ADAPTER = TypeAdapter(BacktestResponse)
+EXPERIMENT_LIST_ADAPTER = TypeAdapter(list[Experiment])
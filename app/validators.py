@@ -0,0 +1,109 @@
+"""
+Standalone Request Validators
+
+Hand-inlined checks equivalent to the pydantic request schemas, for the hot
+/predict path where the body is parsed with orjson and the model is built
+with model_construct instead of being validated field by field.
+"""
+
+import numpy as np
+
+_PREDICTION_REQUIRED = frozenset((
+    "home_goals_avg", "away_goals_avg", "home_win_rate", "away_win_rate", "odds", "bankroll"
+))
+_PREDICTION_FIELDS = _PREDICTION_REQUIRED | {"kelly_fraction"}
+
+# JSON numbers decode to int or float; bool is excluded even though it subclasses int
+_NUMBER_TYPES = (int, float)
+
+def prediction_in_range(
+    home_win_rate: float,
+    away_win_rate: float,
+    odds: tuple[float, float, float],
+    bankroll: float,
+    kelly_fraction: float
+) -> bool:
+    """All PredictionRequest numeric bounds as one flat predicate"""
+    return (
+        0 <= home_win_rate <= 1 and 0 <= away_win_rate <= 1
+        and min(odds) > 1
+        and bankroll > 0 and 0 <= kelly_fraction <= 1
+    )
+
+def prediction_in_range_array(
+    home_win_rate: np.ndarray,
+    away_win_rate: np.ndarray,
+    odds: np.ndarray,
+    bankroll: float,
+    kelly_fraction: float
+) -> np.ndarray:
+    """Vectorized prediction_in_range over N matches (odds of shape (N, 3)), as a bool mask"""
+    shared_ok = bankroll > 0 and 0 <= kelly_fraction <= 1
+    return (
+        (0 <= home_win_rate) & (home_win_rate <= 1)
+        & (0 <= away_win_rate) & (away_win_rate <= 1)
+        & (odds.min(axis=1) > 1)
+        & shared_ok
+    )
+
+def prediction_range_failures(
+    home_win_rate: float,
+    away_win_rate: float,
+    odds: tuple[float, float, float],
+    bankroll: float,
+    kelly_fraction: float
+) -> list[str]:
+    """Names of the fields that fail prediction_in_range, for error messages"""
+    return [
+        name for name, ok in (
+            ("home_win_rate", 0 <= home_win_rate <= 1),
+            ("away_win_rate", 0 <= away_win_rate <= 1),
+            ("odds", min(odds) > 1),
+            ("bankroll", bankroll > 0),
+            ("kelly_fraction", 0 <= kelly_fraction <= 1)
+        ) if not ok
+    ]
+
+def validate_prediction_request(data) -> None:
+    """
+    Validate a decoded /predict body against the PredictionRequest schema
+    
+    Args:
+        data: Decoded JSON body
+    
+    Raises:
+        ValueError: If the body is not an object, has missing or unknown keys,
+            holds non-numeric values or breaks a range constraint
+    """
+    if type(data) is not dict:
+        raise ValueError("Request body must be a JSON object")
+    
+    keys = data.keys()
+    if not (_PREDICTION_REQUIRED <= keys <= _PREDICTION_FIELDS):
+        missing = sorted(_PREDICTION_REQUIRED - keys)
+        unknown = sorted(keys - _PREDICTION_FIELDS)
+        problems = []
+        if missing:
+            problems.append(f"missing {', '.join(missing)}")
+        if unknown:
+            problems.append(f"unknown {', '.join(unknown)}")
+        raise ValueError(f"Invalid fields: {'; '.join(problems)}")
+    
+    home_win_rate = data["home_win_rate"]
+    away_win_rate = data["away_win_rate"]
+    odds = data["odds"]
+    bankroll = data["bankroll"]
+    kelly_fraction = data.get("kelly_fraction", 0.5)
+    
+    if not (
+        type(data["home_goals_avg"]) in _NUMBER_TYPES and type(data["away_goals_avg"]) in _NUMBER_TYPES
+        and type(home_win_rate) in _NUMBER_TYPES and type(away_win_rate) in _NUMBER_TYPES
+        and type(bankroll) in _NUMBER_TYPES and type(kelly_fraction) in _NUMBER_TYPES
+        and type(odds) is list and len(odds) == 3
+        and type(odds[0]) in _NUMBER_TYPES and type(odds[1]) in _NUMBER_TYPES and type(odds[2]) in _NUMBER_TYPES
+    ):
+        raise ValueError("Fields must be numbers and odds a list of 3 numbers")
+    
+    if not prediction_in_range(home_win_rate, away_win_rate, odds, bankroll, kelly_fraction):
+        failed = prediction_range_failures(home_win_rate, away_win_rate, odds, bankroll, kelly_fraction)
+        raise ValueError(f"Out of range: {', '.join(failed)}")
@@ -0,0 +1,99 @@
+"""
+API endpoint tests
+"""
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.schemas import MAX_BATCH_MATCHES
+from tests.test_validators import VALID
+
+BATCH = {
+    "home_goals_avg": [1.5, 0.9],
+    "away_goals_avg": [1.2, 1.7],
+    "home_win_rate": [0.55, 0.3],
+    "away_win_rate": [0.45, 0.6],
+    "odds": [[2.0, 3.5, 3.8], [4.2, 3.6, 1.8]],
+    "bankroll": 1000,
+    "kelly_fraction": 0.5
+}
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+def test_predict(client):
+    response = client.post("/predict", json=VALID)
+
+    assert response.status_code == 200
+    assert response.json()["recommended_outcome"] in ("home", "draw", "away")
+
+@pytest.mark.parametrize("body", [b"{", b"", b"[1, 2]", b'{"home_goals_avg": NaN}'])
+def test_predict_malformed_json(client, body):
+    response = client.post("/predict", content=body, headers={"content-type": "application/json"})
+
+    assert response.status_code == 422
+
+@pytest.mark.parametrize("changes", [
+    {"home_goals_avg": "1.5"},
+    {"odds": ["2.0", 3.5, 3.8]},
+    {"bankroll": "1000"},
+    {"kelly_fraction": True},
+])
+def test_numeric_strings_and_bools_rejected_everywhere(client, changes):
+    assert client.post("/predict", json={**VALID, **changes}).status_code == 422
+
+    batch_changes = {
+        name: value if name in ("bankroll", "kelly_fraction") else [value, BATCH[name][1]]
+        for name, value in changes.items()
+    }
+    assert client.post("/predict_batch", json={**BATCH, **batch_changes}).status_code == 422
+
+def test_predict_batch(client):
+    response = client.post("/predict_batch", json=BATCH)
+
+    assert response.status_code == 200
+    assert len(response.json()["recommended_outcome"]) == 2
+
+def test_predict_batch_reports_out_of_range_index(client):
+    response = client.post("/predict_batch", json={**BATCH, "odds": [[2.0, 3.5, 3.8], [4.2, 1.0, 1.8]]})
+
+    assert response.status_code == 422
+    assert "index 1: odds" in response.text
+
+def test_predict_batch_matches_predict_row_for_row(client):
+    rng = random.Random(42)
+    n = 500
+    batch = {
+        "home_goals_avg": [round(rng.uniform(0, 3.5), 2) for _ in range(n)],
+        "away_goals_avg": [round(rng.uniform(0, 3.5), 2) for _ in range(n)],
+        "home_win_rate": [round(rng.uniform(0.01, 0.99), 3) for _ in range(n)],
+        "away_win_rate": [round(rng.uniform(0.01, 0.99), 3) for _ in range(n)],
+        "odds": [[round(rng.uniform(1.05, 12), 2) for _ in range(3)] for _ in range(n)],
+        "bankroll": 1000,
+        "kelly_fraction": 0.5
+    }
+    response = client.post("/predict_batch", json=batch)
+    assert response.status_code == 200
+    results = response.json()
+    
+    for i in range(n):
+        single = {name: values[i] for name, values in batch.items() if isinstance(values, list)}
+        expected = client.post("/predict", json={**single, "bankroll": 1000, "kelly_fraction": 0.5}).json()
+        assert {name: values[i] for name, values in results.items()} == expected, f"match {i}"
+
+def test_predict_batch_size_limit(client):
+    n = MAX_BATCH_MATCHES + 1
+    batch = {
+        name: [values[0]] * n if isinstance(values, list) else values
+        for name, values in BATCH.items()
+    }
+    
+    response = client.post("/predict_batch", json=batch)
+    
+    assert response.status_code == 422
+    assert "too_long" in response.text
@@ -0,0 +1,127 @@
+"""
+Backtester regression tests
+"""
+
+import csv
+import os
+import warnings
+
+import pytest
+
+from app.core import backtester, fuzzy_engine, hybrid_engine, kelly, stat_engine
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+FIXTURE = os.path.join(DATA_DIR, "synthetic_matches_300.csv")
+
+def _reference_backtest(data_path: str, initial_bankroll: float = 7000.0) -> dict:
+    """Row-by-row backtest on the scalar engines, the behaviour run_backtest_sync must match"""
+    bankroll = initial_bankroll
+    total_bets = 0
+    winning_bets = 0
+    
+    with open(data_path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                values = {name: float(row[name]) for name in backtester._COLUMNS}
+            except ValueError:
+                continue
+            
+            odds_home = values["odds_home"]
+            if not (
+                odds_home > 1.0 and values["odds_draw"] > 1.0 and values["odds_away"] > 1.0
+                and odds_home < backtester._MAX_ODDS
+                and 0 <= values["home_win_rate"] <= 1 and 0 <= values["away_win_rate"] <= 1
+            ):
+                continue
+            
+            p_stat = stat_engine.calculate_probability(
+                values["home_goals_avg"], values["away_goals_avg"],
+                values["home_win_rate"], values["away_win_rate"]
+            )
+            p_fuzzy = fuzzy_engine.calculate_probability(
+                values["home_goals_avg"], values["away_goals_avg"],
+                odds_home, values["odds_draw"], values["odds_away"]
+            )
+            p_hybrid = hybrid_engine.combine_probabilities(p_stat, p_fuzzy)[0]
+            if p_hybrid <= 1.0 / odds_home + 0.02:
+                continue
+            
+            _, stake = kelly.calculate_stake(p_hybrid, odds_home, bankroll, kelly_fraction=0.25)
+            if stake <= 0:
+                continue
+            
+            total_bets += 1
+            if values["outcome"] == 1:
+                winning_bets += 1
+                bankroll += stake * (odds_home - 1)
+            else:
+                bankroll -= stake
+    
+    return {"total_bets": total_bets, "winning_bets": winning_bets, "final_bankroll": round(bankroll, 2)}
+
+def test_fixture_places_bets():
+    result = backtester.run_backtest_sync(FIXTURE)
+    
+    assert result["total_bets"] == 187
+    assert result["winning_bets"] + result["losing_bets"] == result["total_bets"]
+    assert len(result["equity_curve"]) == result["total_bets"] + 1
+
+def test_matches_row_by_row_reference():
+    result = backtester.run_backtest_sync(FIXTURE)
+    expected = _reference_backtest(FIXTURE)
+    
+    assert result["total_bets"] == expected["total_bets"]
+    assert result["winning_bets"] == expected["winning_bets"]
+    assert result["final_bankroll"] == pytest.approx(expected["final_bankroll"], rel=1e-9)
+
+def _write_rows(path, rows, quoting=csv.QUOTE_MINIMAL):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        csv.writer(f, quoting=quoting).writerows(rows)
+    return str(path)
+
+@pytest.fixture
+def fixture_rows():
+    with open(FIXTURE, "r", encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+def test_fully_quoted_csv(tmp_path, fixture_rows):
+    path = _write_rows(tmp_path / "quoted.csv", fixture_rows, quoting=csv.QUOTE_ALL)
+    
+    result = backtester.run_backtest_sync(path)
+    expected = backtester.run_backtest_sync(FIXTURE)
+    
+    assert result["total_bets"] == 187
+    assert result["final_bankroll"] == expected["final_bankroll"]
+
+def test_quoted_text_column_with_comma(tmp_path, fixture_rows):
+    header, *rows = fixture_rows
+    path = _write_rows(tmp_path / "teams.csv", [["team"] + header] + [["Brighton, Hove"] + row for row in rows])
+    
+    result = backtester.run_backtest_sync(path)
+    expected = backtester.run_backtest_sync(FIXTURE)
+    
+    assert result["total_bets"] == 187
+    assert result["final_bankroll"] == expected["final_bankroll"]
+
+def test_malformed_row_is_skipped(tmp_path, fixture_rows):
+    header, *rows = fixture_rows
+    rows[5] = ["oops"] + rows[5][1:]
+    path = _write_rows(tmp_path / "malformed.csv", [["team"] + header] + [["A, B"] + row for row in rows])
+    
+    result = backtester.run_backtest_sync(path)
+    expected = _reference_backtest(path)
+    
+    assert result["total_bets"] == expected["total_bets"]
+    assert result["final_bankroll"] == pytest.approx(expected["final_bankroll"], rel=1e-9)
+
+def test_trailing_blank_chunk_does_not_warn(tmp_path, fixture_rows, monkeypatch):
+    monkeypatch.setattr(backtester, "_CHUNK_ROWS", 100)
+    path = _write_rows(tmp_path / "trailing.csv", fixture_rows)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n" * 150)
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        result = backtester.run_backtest_sync(path)
+    
+    assert result["total_bets"] == 187
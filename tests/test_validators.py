@@ -0,0 +1,100 @@
+"""
+Request validator tests
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas import PredictionRequest
+from app.validators import validate_prediction_request
+
+VALID = {
+    "home_goals_avg": 1.5,
+    "away_goals_avg": 1.2,
+    "home_win_rate": 0.55,
+    "away_win_rate": 0.45,
+    "odds": [2.0, 3.5, 3.8],
+    "bankroll": 1000,
+    "kelly_fraction": 0.5
+}
+
+def _with(**changes) -> dict:
+    return {**VALID, **changes}
+
+def _without(name: str) -> dict:
+    return {key: value for key, value in VALID.items() if key != name}
+
+def _assert_same_verdict(data, valid: bool):
+    """validate_prediction_request and PredictionRequest must accept and reject the same bodies"""
+    if valid:
+        validate_prediction_request(data)
+        PredictionRequest.model_validate(data)
+    else:
+        with pytest.raises(ValueError):
+            validate_prediction_request(data)
+        with pytest.raises(ValidationError):
+            PredictionRequest.model_validate(data)
+
+def test_valid_body():
+    _assert_same_verdict(VALID, True)
+
+def test_kelly_fraction_is_optional():
+    _assert_same_verdict(_without("kelly_fraction"), True)
+
+def test_integer_values_accepted():
+    _assert_same_verdict(_with(home_goals_avg=2, odds=[2, 3, 4], home_win_rate=1, away_win_rate=0), True)
+
+@pytest.mark.parametrize("data", [[VALID], "body", 1, None])
+def test_non_object_body(data):
+    with pytest.raises(ValueError, match="JSON object"):
+        validate_prediction_request(data)
+
+@pytest.mark.parametrize("name", ["home_goals_avg", "away_goals_avg", "home_win_rate", "away_win_rate", "odds", "bankroll"])
+def test_missing_key(name):
+    with pytest.raises(ValueError, match=f"missing {name}"):
+        validate_prediction_request(_without(name))
+    _assert_same_verdict(_without(name), False)
+
+def test_unknown_key():
+    with pytest.raises(ValueError, match="unknown team"):
+        validate_prediction_request(_with(team="Brighton"))
+    _assert_same_verdict(_with(team="Brighton"), False)
+
+@pytest.mark.parametrize("name", ["home_goals_avg", "home_win_rate", "bankroll", "kelly_fraction"])
+@pytest.mark.parametrize("value", [True, False, "0.5", None, [0.5]])
+def test_non_number_rejected(name, value):
+    _assert_same_verdict(_with(**{name: value}), False)
+
+@pytest.mark.parametrize("odds", [[2.0, 3.5], [2.0, 3.5, 3.8, 4.0], [], [2.0, True, 3.8], [2.0, "3.5", 3.8], 2.0, {"home": 2.0}])
+def test_malformed_odds(odds):
+    _assert_same_verdict(_with(odds=odds), False)
+
+@pytest.mark.parametrize("name, value, valid", [
+    ("home_win_rate", 0, True),
+    ("home_win_rate", 1, True),
+    ("home_win_rate", -0.01, False),
+    ("home_win_rate", 1.01, False),
+    ("away_win_rate", 0, True),
+    ("away_win_rate", 1, True),
+    ("away_win_rate", -0.01, False),
+    ("away_win_rate", 1.01, False),
+    ("bankroll", 0.01, True),
+    ("bankroll", 0, False),
+    ("bankroll", -1, False),
+    ("kelly_fraction", 0, True),
+    ("kelly_fraction", 1, True),
+    ("kelly_fraction", -0.01, False),
+    ("kelly_fraction", 1.01, False),
+])
+def test_range_bounds(name, value, valid):
+    _assert_same_verdict(_with(**{name: value}), valid)
+    if not valid:
+        with pytest.raises(ValueError, match=f"Out of range: {name}"):
+            validate_prediction_request(_with(**{name: value}))
+
+@pytest.mark.parametrize("index", [0, 1, 2])
+@pytest.mark.parametrize("value, valid", [(1.0, False), (0.5, False), (1.01, True)])
+def test_odds_bound(index, value, valid):
+    odds = [2.0, 3.5, 3.8]
+    odds[index] = value
+    _assert_same_verdict(_with(odds=odds), valid)